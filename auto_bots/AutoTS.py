@@ -1,20 +1,33 @@
+import numbers
 import warnings
 import datetime as dt
-from functools import reduce
-from typing import Union, List, Tuple
+from typing import Any, Union, List, Tuple
 
 import pandas as pd
 import numpy as np
-from pmdarima import auto_arima
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-
-from tbats import BATS
-
-from auto_bots.utils.error_metrics import mase, mse, rmse
+from joblib import Parallel, cpu_count, delayed
+from threadpoolctl import threadpool_limits
+
+from auto_bots.utils.error_metrics import (
+    _mase_denominator,
+    _mase_kernel,
+    _mse_kernel,
+    _rmse_kernel,
+)
 from auto_bots.utils import validation as val
 from auto_bots.utils.CandidateModel import CandidateModel
 
 
+def _ignore_statsmodels_warnings() -> None:
+    """
+    Silences statsmodels' warnings. statsmodels adds "always" filters for its own warnings when it's
+    first imported, so it has to be imported before our filter can take precedence
+    """
+    import statsmodels.tools.sm_exceptions  # noqa: F401
+
+    warnings.filterwarnings("ignore", module="statsmodels")
+
+
 class AutoTS:
     """
     Automatic modeler that finds the best time-series method to model your data
@@ -25,8 +38,25 @@ class AutoTS:
     :param seasonal_period: period of the data's seasonal trend. 3 would mean your data has quarterly
     trends. Supported models can use multiple seasonalities if a list is provided (Non-supported models
     will use the first item in list). None implies no seasonality.
+    :param parallel_arima_search: if True, auto_arima searches the full grid of models (rather than its
+    default stepwise search) spread across all available cores. auto_arima is then fit on its own, before
+    the other models, so it has the cores to itself. An `n_jobs` given in `auto_arima_args` still takes
+    precedence. Slower on a single core, but can be faster and find better models when cores are free.
+    default=False
+    :param blas_threads: number of threads BLAS may use while fitting each model. The models mostly
+    do many tiny matrix operations, where extra threads add more overhead than they save. default=1
+    :param mase_seasonal_period: lag of the naive forecast MASE scales errors by. None uses the first
+    seasonal period (rounded down) if one is given, otherwise 1. Falls back to 1 if the series given
+    during fit isn't longer than the lag
     """
 
+    # methods used to fit each model that is trained directly on the data (everything but ensemble)
+    _base_model_fitters = {
+        "auto_arima": "_fit_auto_arima",
+        "exponential_smoothing": "_fit_exponential_smoothing",
+        "tbats": "_fit_tbats",
+    }
+
     def __init__(
         self,
         model_names: Union[Tuple[str], List[str]] = (
@@ -41,6 +71,9 @@ class AutoTS:
         auto_arima_args: dict = None,
         exponential_smoothing_args: dict = None,
         tbats_args: dict = None,
+        parallel_arima_search: bool = False,
+        blas_threads: int = 1,
+        mase_seasonal_period: int = None,
     ):
         self.verbose = verbose
 
@@ -57,6 +90,16 @@ class AutoTS:
         valid_error_metrics = ["mase", "mse", "rmse"]
         if error_metric.lower() not in valid_error_metrics:
             raise ValueError(f"Error metric must be one of {valid_error_metrics}")
+        if mase_seasonal_period is not None:
+            # like seasonal_period, accept any integer-valued number (numpy ints, 12.0), but not bools
+            if (
+                isinstance(mase_seasonal_period, bool)
+                or not isinstance(mase_seasonal_period, numbers.Real)
+                or not float(mase_seasonal_period).is_integer()
+                or mase_seasonal_period < 1
+            ):
+                raise ValueError("`mase_seasonal_period` must be a positive integer")
+            mase_seasonal_period = int(mase_seasonal_period)
 
         self.model_names = [model.lower() for model in model_names]
         self.error_metric = error_metric.lower()
@@ -65,6 +108,13 @@ class AutoTS:
         self.auto_arima_args = auto_arima_args
         self.exponential_smoothing_args = exponential_smoothing_args
         self.tbats_args = tbats_args
+        self.parallel_arima_search = parallel_arima_search
+        self.blas_threads = blas_threads
+        if mase_seasonal_period is None:
+            mase_seasonal_period = (
+                1 if self.seasonal_period is None else int(self.seasonal_period[0])
+            )
+        self.mase_seasonal_period = mase_seasonal_period
 
         # Set during fitting or by other methods
         self.data = None
@@ -72,14 +122,26 @@ class AutoTS:
         self.freq = None
         self.exogenous = None
         self.using_exogenous = False
+        self._series_values = None
+        self._series = None
+        self._mase_denom = None
+        self._index_values = None
+        self._last_data_date = None
+        self._latest_valid_start = None
         self.candidate_models = []
+        self._candidates_by_type = {}
+        self._errors = None
+        self._predict_dispatch = {}
+        # exponential smoothing solutions from previous fits, keyed by series length
+        self._es_warm_cache = {}
+        self.n_fit_workers = 1
         self.fit_model = None
         self.fit_model_type = None
         self.best_model_error = None
         self.is_fitted = False
         self.prediction_index = None
 
-        warnings.filterwarnings("ignore", module="statsmodels")
+        _ignore_statsmodels_warnings()
 
     def fit(
         self,
@@ -100,6 +162,91 @@ class AutoTS:
         regressors. auto_arima is the only model that supports exogenous regressors. The repressor
         columns should not be a constant or a trend
         """
+        # the pool pickles this instance into every worker, so drop the previous fit's models first
+        # rather than shipping them to workers that are about to replace them
+        self.candidate_models = []
+        self._candidates_by_type = {}
+        self._errors = None
+        self._predict_dispatch = {}
+        self.fit_model = None
+        self.fit_model_type = None
+        self.best_model_error = None
+        self.is_fitted = False
+
+        self._set_input_data(data, series_column_name, freq, exogenous)
+
+        # the individual models don't depend on each other, so fit them in parallel
+        base_model_names = [
+            name for name in self.model_names if name in self._base_model_fitters
+        ]
+        # a parallel arima search spreads itself across every core, so it's fit on its own rather
+        # than competing with the other models for cores inside the pool
+        solo_names = []
+        if self.parallel_arima_search and "auto_arima" in base_model_names:
+            solo_names.append("auto_arima")
+        pooled_names = [name for name in base_model_names if name not in solo_names]
+
+        fit_candidates = {}
+        self.n_fit_workers = 1
+        for name in solo_names:
+            fit_candidates[name] = self._fit_candidate(name)
+        if pooled_names:
+            self.n_fit_workers = min(len(pooled_names), cpu_count())
+            pooled_candidates = Parallel(
+                n_jobs=self.n_fit_workers, backend="loky", prefer="processes"
+            )(delayed(self._fit_candidate)(name) for name in pooled_names)
+            fit_candidates.update(zip(pooled_names, pooled_candidates))
+        self.candidate_models = [fit_candidates[name] for name in base_model_names]
+        if self.verbose >= 1:
+            for candidate in self.candidate_models:
+                print(
+                    f"\tTrained {candidate.model_type} model with error {candidate.error:.4f}"
+                )
+
+        if "ensemble" in self.model_names:
+            if self.candidate_models is None:
+                raise ValueError("No candidate models to ensemble")
+            self.candidate_models.append(self._fit_ensemble())
+            if self.verbose >= 1:
+                print(
+                    f"\tTrained ensemble model with error {self.candidate_models[-1].error:.4f}"
+                )
+
+        self._errors = np.array([candidate.error for candidate in self.candidate_models])
+        # nanargmin can't pick from all NaNs, so fall back to the first candidate as sorting them did
+        best_idx = 0
+        if not np.isnan(self._errors).all():
+            best_idx = int(np.nanargmin(self._errors))
+        best_candidate = self.candidate_models[best_idx]
+        self.best_model_error = best_candidate.error
+        self.fit_model = best_candidate.fit_model
+        self.fit_model_type = best_candidate.model_type
+        self._candidates_by_type = {
+            candidate.model_type: candidate for candidate in self.candidate_models
+        }
+        # every predict method takes the same arguments, so predict() can look one up by model type
+        self._predict_dispatch = {
+            "auto_arima": self._predict_auto_arima,
+            "exponential_smoothing": self._predict_exponential_smoothing,
+            "tbats": self._predict_tbats,
+            "ensemble": self._predict_ensemble,
+        }
+        # models may have been fit in worker processes, so exponential smoothing's solution is saved
+        # here, where it will persist until the next fit
+        if "exponential_smoothing" in self._candidates_by_type:
+            es_retvals = self._candidates_by_type["exponential_smoothing"].fit_model.mle_retvals
+            if es_retvals is not None:
+                self._es_warm_cache[len(self._series_values)] = es_retvals.x
+        self.is_fitted = True
+
+    def _set_input_data(
+        self,
+        data: pd.DataFrame,
+        series_column_name: str,
+        freq: str,
+        exogenous: Union[str, list, None],
+    ) -> None:
+        """Validates the data given during fit and caches the pieces of it the models use"""
         val.check_datetime_index(data)
         self.data = data
         self.series_column_name = series_column_name
@@ -107,12 +254,15 @@ class AutoTS:
         if freq == "infer":
             self.freq = pd.infer_freq(data.index.to_series())
         else:
-            if freq not in list(pd.tseries.frequencies._offset_to_period_map):
+            try:
+                pd.tseries.frequencies.to_offset(freq)
+            except ValueError:
                 raise ValueError(
                     f"'{freq}' is not a recognized frequency option. "
                     f"`freq` must be 'infer' or one of the offsets described at this link: "
                     f"https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases "
                 )
+            self.freq = freq
 
         # if user passes a string value (single column), make sure we can always assume exogenous is a list
         if isinstance(exogenous, str):
@@ -122,38 +272,40 @@ class AutoTS:
             self.using_exogenous = True
             self.exogenous = exogenous
 
-        if "auto_arima" in self.model_names:
-            self.candidate_models.append(self._fit_auto_arima())
-            if self.verbose >= 1:
-                print(
-                    f"\tTrained auto_arima model with error {self.candidate_models[-1].error:.4f}"
-                )
-        if "exponential_smoothing" in self.model_names:
-            self.candidate_models.append(self._fit_exponential_smoothing())
-            if self.verbose >= 1:
-                print(
-                    f"\tTrained exponential_smoothing model with error {self.candidate_models[-1].error:.4f}"
-                )
-        if "tbats" in self.model_names:
-            self.candidate_models.append(self._fit_tbats())
-            if self.verbose >= 1:
-                print(
-                    f"\tTrained tbats model with error {self.candidate_models[-1].error:.4f}"
-                )
-        if "ensemble" in self.model_names:
-            if self.candidate_models is None:
-                raise ValueError("No candidate models to ensemble")
-            self.candidate_models.append(self._fit_ensemble())
-            if self.verbose >= 1:
-                print(
-                    f"\tTrained ensemble model with error {self.candidate_models[-1].error:.4f}"
-                )
+        # pull the series out of the dataframe once rather than every time a model needs it. As a
+        # contiguous float64 array, the models can use it without making their own copies
+        self._series_values = np.ascontiguousarray(
+            data[series_column_name].to_numpy(), dtype=np.float64
+        )
+        # exponential smoothing needs the dates to predict by date, so it gets a series view of the array
+        self._series = pd.Series(self._series_values, index=data.index, copy=False)
+
+        # the dates predict() checks against don't change until the next fit
+        self._index_values = data.index.values
+        self._last_data_date = data.index[-1]
+        self._latest_valid_start = pd.date_range(
+            self._last_data_date, periods=2, freq=self.freq
+        )[-1]
 
-        self.candidate_models = sorted(self.candidate_models, key=lambda x: x.error)
-        self.best_model_error = self.candidate_models[0].error
-        self.fit_model = self.candidate_models[0].fit_model
-        self.fit_model_type = self.candidate_models[0].model_type
-        self.is_fitted = True
+        # mase's denominator only depends on the actuals, so every candidate can share it
+        if self.error_metric == "mase":
+            mase_lag = self.mase_seasonal_period
+            # a seasonal naive forecast needs at least one full period of data (and a period of at
+            # least 1, which float seasonal periods below 1 round down to 0 from)
+            if not 1 <= mase_lag < len(self._series_values):
+                mase_lag = 1
+            self._mase_denom = _mase_denominator(self._series_values, mase_lag)
+
+    def _fit_candidate(self, model_name: str) -> CandidateModel:
+        """
+        Fits a single candidate model. Meant to be run in a worker process
+        :param model_name: name of the model to fit, must be a key of `_base_model_fitters`
+        :return: the fit candidate model
+        """
+        # worker processes don't inherit the warning filters set during initialization
+        with warnings.catch_warnings():
+            _ignore_statsmodels_warnings()
+            return getattr(self, self._base_model_fitters[model_name])()
 
     def _fit_auto_arima(self) -> CandidateModel:
         """
@@ -162,6 +314,9 @@ class AutoTS:
         second is the arima model, the third is the name of the model, and the fourth is the
         predictions made on the test set
         """
+        # models are imported lazily so users who skip one don't pay its (large) import cost
+        from pmdarima import auto_arima
+
         exog = None
         if self.using_exogenous:
             exog = self.data[self.exogenous]
@@ -175,53 +330,29 @@ class AutoTS:
             # since auto_arima supports only 1 seasonality, select the first one as "main" seasonality
             auto_arima_seasonal_period = int(auto_arima_seasonal_period[0])
 
-        try:
-            model = auto_arima(
-                self.data[self.series_column_name],
-                error_action="ignore",
-                supress_warning=True,
-                seasonal=self.is_seasonal,
-                m=auto_arima_seasonal_period,
-                exogenous=exog,
-                **self.auto_arima_args,
-            )
+        # if user doesn't specify with kwargs, use these defaults. The OCSB seasonal differencing
+        # test is slow and occasionally fails with numpy errors, so use Canova-Hansen unless asked
+        aa_args = {"seasonal_test": "ch", "suppress_warnings": True}
+        if self.parallel_arima_search:
+            aa_args.update({"stepwise": False, "n_jobs": -1, "max_order": 6})
+        aa_args.update(self.auto_arima_args)
 
-        # occasionally while determining the necessary level of seasonal differencing, we get a weird
-        # numpy dot product error due to array sizes mismatching. If that happens, we try using
-        # Canova-Hansen test for seasonal differencing instead
-        except ValueError:
-            if self.verbose >= 2:
-                print(
-                    "\tSeasonal differencing for auto_arima failed. Trying Canova-Hansen method."
-                )
-            if (
-                "seasonal_test" in self.auto_arima_args.keys()
-                and self.auto_arima_args["seasonal_test"] == "ocsb"
-            ):
-                warnings.warn(
-                    'Forcing `seasonal_test="ch"` as "ocsb" occasionally causes numpy errors',
-                    UserWarning,
-                )
-            self.auto_arima_args["seasonal_test"] = "ch"
+        with threadpool_limits(limits=self.blas_threads, user_api="blas"):
             model = auto_arima(
-                self.data[self.series_column_name],
+                self._series_values,
                 error_action="ignore",
-                supress_warning=True,
                 seasonal=self.is_seasonal,
                 m=auto_arima_seasonal_period,
                 exogenous=exog,
-                **self.auto_arima_args,
+                **aa_args,
             )
 
-        test_predictions = pd.DataFrame(
-            {
-                "actuals": self.data[self.series_column_name],
-                "aa_test_predictions": model.predict_in_sample(exogenous=exog),
-            }
-        )
+        predictions = np.asarray(model.predict_in_sample(exogenous=exog))
+        test_error = self._error_metric(predictions, self._series_values)
 
-        test_error = self._error_metric(
-            test_predictions, "aa_test_predictions", "actuals"
+        test_predictions = pd.DataFrame(
+            {"actuals": self._series_values, "aa_test_predictions": predictions},
+            index=self.data.index,
         )
 
         return CandidateModel(test_error, model, "auto_arima", test_predictions)
@@ -233,13 +364,14 @@ class AutoTS:
         second is the exponential smoothing model, the third is the name of the model, and the
         fourth is the predictions made on the test set
         """
-        # if user doesn't specify with kwargs, set these defaults
-        if "trend" not in self.exponential_smoothing_args.keys():
-            self.exponential_smoothing_args["trend"] = "add"
-        if "seasonal" not in self.exponential_smoothing_args.keys():
-            self.exponential_smoothing_args["seasonal"] = (
-                "add" if self.seasonal_period is not None else None
-            )
+        from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+        # if user doesn't specify with kwargs, use these defaults
+        es_args = {
+            "trend": "add",
+            "seasonal": "add" if self.seasonal_period is not None else None,
+            **self.exponential_smoothing_args,
+        }
 
         es_seasonal_period = self.seasonal_period
         if self.seasonal_period is not None:
@@ -247,23 +379,30 @@ class AutoTS:
                 es_seasonal_period[0]
             )  # es supports only 1 seasonality
 
-        model = ExponentialSmoothing(
-            self.data[self.series_column_name],
-            seasonal_periods=es_seasonal_period,
-            **self.exponential_smoothing_args,
-        ).fit()
+        # if we've fit a series of this length before, start the optimizer from that solution instead
+        # of searching for starting values from scratch
+        fit_args = {}
+        start_params = self._es_warm_cache.get(len(self._series_values))
+        if start_params is not None:
+            fit_args = {"start_params": start_params, "use_brute": False}
+
+        with threadpool_limits(limits=self.blas_threads, user_api="blas"):
+            model = ExponentialSmoothing(
+                self._series,
+                seasonal_periods=es_seasonal_period,
+                **es_args,
+            ).fit(**fit_args)
+
+        predictions = np.asarray(
+            model.predict(start=0, end=len(self._series_values) - 1)
+        )
+        error = self._error_metric(predictions, self._series_values)
 
         test_predictions = pd.DataFrame(
-            {
-                "actuals": self.data[self.series_column_name],
-                "es_test_predictions": model.predict(
-                    self.data.index[0], self.data.index[-1]
-                ),
-            }
+            {"actuals": self._series_values, "es_test_predictions": predictions},
+            index=self.data.index,
         )
 
-        error = self._error_metric(test_predictions, "es_test_predictions", "actuals")
-
         return CandidateModel(error, model, "exponential_smoothing", test_predictions)
 
     def _fit_tbats(self) -> CandidateModel:
@@ -273,30 +412,36 @@ class AutoTS:
         second is the BATS model, the third is the name of the model, and the
         fourth is the predictions made on the test set
         """
+        from tbats import BATS
+
         tbats_seasonal_periods = self.seasonal_period
         if self.seasonal_period is not None:
             tbats_seasonal_periods = self.seasonal_period
 
-        # if user doesn't specify with kwargs, set these defaults
-        if "n_jobs" not in self.tbats_args.keys():
-            self.tbats_args["n_jobs"] = 1
-        if "use_arma_errors" not in self.tbats_args.keys():
-            self.tbats_args["use_arma_errors"] = False  # helps speed up modeling a bit
+        # if user doesn't specify with kwargs, use these defaults
+        tbats_args = {
+            "n_jobs": 1,
+            "use_arma_errors": False,  # helps speed up modeling a bit
+            **self.tbats_args,
+        }
+        # when the models are being fit in parallel, tbats gets a single core so we don't oversubscribe
+        if self.n_fit_workers > 1:
+            tbats_args["n_jobs"] = 1
 
         model = BATS(
             seasonal_periods=tbats_seasonal_periods,
             use_box_cox=False,
-            **self.tbats_args,
+            **tbats_args,
         )
-        fit_model = model.fit(self.data[self.series_column_name])
+        with threadpool_limits(limits=self.blas_threads, user_api="blas"):
+            fit_model = model.fit(self._series_values)
+
+        error = self._error_metric(fit_model.y_hat, self._series_values)
 
         test_predictions = pd.DataFrame(
-            {
-                "actuals": self.data[self.series_column_name],
-                "tb_test_predictions": fit_model.y_hat,
-            }
+            {"actuals": self._series_values, "tb_test_predictions": fit_model.y_hat},
+            index=self.data.index,
         )
-        error = self._error_metric(test_predictions, "tb_test_predictions", "actuals")
 
         return CandidateModel(error, fit_model, "tbats", test_predictions)
 
@@ -307,70 +452,59 @@ class AutoTS:
         second is the exponential smoothing model, the third is the name of the model, and the
         fourth is the predictions made on the test set
         """
-        model_predictions = [
-            candidate.predictions for candidate in self.candidate_models
-        ]
-        all_predictions = reduce(
-            lambda left, right: pd.merge(
-                left,
-                right.drop("actuals", axis="columns"),
-                left_index=True,
-                right_index=True,
-            ),
-            model_predictions,
+        # every candidate was fit on the same index, so their predictions line up row for row
+        model_predictions = np.column_stack(
+            [
+                candidate.predictions.drop("actuals", axis="columns").to_numpy()
+                for candidate in self.candidate_models
+            ]
         )
-        predictions_columns = [
-            col for col in all_predictions.columns if str(col).endswith("predictions")
-        ]
-        all_predictions["en_test_predictions"] = all_predictions[
-            predictions_columns
-        ].mean(axis="columns")
+        predictions = model_predictions.mean(axis=1)
+        error = self._error_metric(predictions, self._series_values)
 
-        error = self._error_metric(all_predictions, "en_test_predictions", "actuals")
-
-        return CandidateModel(
-            error, None, "ensemble", all_predictions[["actuals", "en_test_predictions"]]
+        all_predictions = pd.DataFrame(
+            {"actuals": self._series_values, "en_test_predictions": predictions},
+            index=self.data.index,
         )
 
-    def _error_metric(
-        self, data: pd.DataFrame, predictions_column: str, actuals_column: str
-    ) -> float:
+        return CandidateModel(error, None, "ensemble", all_predictions)
+
+    def _error_metric(self, predictions: np.ndarray, actuals: np.ndarray) -> float:
         """
         Computes error using the error metric specified during initialization
-        :param data: pandas dataframe containing predictions and actuals
-        :param predictions_column: name of the predictions column
-        :param actuals_column: name of the actuals column
+        :param predictions: array of predictions
+        :param actuals: array of actuals, the same length as `predictions`
         :return: error for given data
         """
         if self.error_metric == "mase":
-            return mase(data, predictions_column, actuals_column)
+            return _mase_kernel(predictions, actuals, denom=self._mase_denom)
         if self.error_metric == "mse":
-            return mse(data, predictions_column, actuals_column)
+            return _mse_kernel(predictions, actuals)
         if self.error_metric == "rmse":
-            return rmse(data, predictions_column, actuals_column)
+            return _rmse_kernel(predictions, actuals)
 
     def _predict_auto_arima(
         self,
+        model: Any,
         start_date: dt.datetime,
         end_date: dt.datetime,
         last_data_date: dt.datetime,
+        out_index: pd.DatetimeIndex,
         exogenous: pd.DataFrame = None,
     ) -> pd.Series:
         """Uses a fit ARIMA model to predict between the given dates"""
+        start_idx, end_idx = self._locate_prediction_dates(start_date, end_date)
+        last_idx = len(self._index_values) - 1
+
         # start date and end date are both in-sample
-        if end_date <= self.data.index[-1]:
-            preds = self.fit_model.predict_in_sample(
-                start=self.data.index.get_loc(start_date),
-                end=self.data.index.get_loc(end_date),
-                exogenous=exogenous,
+        if end_idx <= last_idx:
+            preds = model.predict_in_sample(
+                start=start_idx, end=end_idx, exogenous=exogenous
             )
 
-        # start date is in-sample but end date is not
-        elif start_date < self.data.index[-1] < end_date:
-            num_extra_periods = (
-                len(pd.date_range(start=last_data_date, end=end_date, freq=self.freq))
-                - 1
-            )
+        # start date is in-sample (possibly the last date given during fit) but end date is not
+        elif start_idx <= last_idx:
+            num_extra_periods = self._num_out_of_sample_periods(out_index, last_data_date)
 
             in_sample_exog, out_of_sample_exog = None, None
             if self.using_exogenous:
@@ -385,123 +519,113 @@ class AutoTS:
                 ]
 
             # get all in sample predictions and stitch them together with out of sample predictions
-            in_sample_preds = self.fit_model.predict_in_sample(
-                start=self.data.index.get_loc(start_date), exogenous=in_sample_exog
+            in_sample_preds = model.predict_in_sample(
+                start=start_idx, exogenous=in_sample_exog
             )
-            out_of_sample_preds = self.fit_model.predict(
+            out_of_sample_preds = model.predict(
                 num_extra_periods, exogenous=out_of_sample_exog
             )
             preds = np.concatenate([in_sample_preds, out_of_sample_preds])
 
         # only possible scenario at this point is start date is 1 period past last data date
         else:
-            periods_to_predict = len(
-                pd.date_range(start=start_date, end=end_date, freq=self.freq)
-            )
-            preds = self.fit_model.predict(periods_to_predict, exogenous=exogenous)
+            preds = model.predict(len(out_index), exogenous=exogenous)
 
-        return pd.Series(
-            preds, index=pd.date_range(start_date, end_date, freq=self.freq)
-        )
+        return pd.Series(preds, index=out_index)
 
     def _predict_exponential_smoothing(
-        self, start_date: dt.datetime, end_date: dt.datetime
+        self,
+        model: Any,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        last_data_date: dt.datetime,
+        out_index: pd.DatetimeIndex,
+        exogenous: pd.DataFrame = None,
     ) -> pd.Series:
         """Uses a fit exponential smoothing model to predict between the given dates"""
-        return self.fit_model.predict(start=start_date, end=end_date)
+        start_idx, _ = self._locate_prediction_dates(start_date, end_date)
+
+        # start date is 1 period past last data date, so skip the in-sample machinery entirely
+        if start_idx == len(self._index_values):
+            preds = model.forecast(len(out_index))
+
+        # integer positions save statsmodels from resolving the dates against its index, but are only
+        # safe if the start date is actually one of the dates given during fit
+        elif self._index_values[start_idx] == pd.Timestamp(start_date).to_datetime64():
+            preds = model.predict(start=start_idx, end=start_idx + len(out_index) - 1)
+
+        else:
+            preds = model.predict(start=start_date, end=end_date)
+
+        return pd.Series(np.asarray(preds), index=out_index)
 
     def _predict_tbats(
         self,
+        model: Any,
         start_date: dt.datetime,
         end_date: dt.datetime,
         last_data_date: dt.datetime,
+        out_index: pd.DatetimeIndex,
+        exogenous: pd.DataFrame = None,
     ) -> pd.Series:
         """Uses a fit BATS model to predict between the given dates"""
-        in_sample_preds = pd.Series(
-            self.fit_model.y_hat,
-            index=pd.date_range(
-                start=self.data.index[0], end=self.data.index[-1], freq=self.freq
-            ),
-        )
+        # the model keeps its in-sample predictions as an array, so slice those by position directly
+        in_sample_preds = np.asarray(model.y_hat)
+        start_idx, end_idx = self._locate_prediction_dates(start_date, end_date)
+        last_idx = len(self._index_values) - 1
 
         # start date and end date are both in-sample
-        if end_date <= in_sample_preds.index[-1]:
-            preds = in_sample_preds.loc[
-                self.prediction_index[0] : self.prediction_index[-1]
-            ]
+        if end_idx <= last_idx:
+            preds = in_sample_preds[start_idx : end_idx + 1]
 
-        # start date is in-sample but end date is not
-        elif start_date < self.data.index[-1] < end_date:
-            num_extra_periods = (
-                len(pd.date_range(start=last_data_date, end=end_date, freq=self.freq))
-                - 1
-            )
+        # start date is in-sample (possibly the last date given during fit) but end date is not
+        elif start_idx <= last_idx:
+            num_extra_periods = self._num_out_of_sample_periods(out_index, last_data_date)
             # get all in sample predictions and stitch them together with out of sample predictions
-            in_sample_portion = in_sample_preds.loc[start_date:]
-            out_of_sample_portion = self.fit_model.forecast(num_extra_periods)
+            in_sample_portion = in_sample_preds[start_idx:]
+            out_of_sample_portion = model.forecast(num_extra_periods)
             preds = np.concatenate([in_sample_portion, out_of_sample_portion])
 
         # only possible scenario at this point is start date is 1 period past last data date
         else:
-            preds = self.fit_model.forecast(len(self.prediction_index))
+            preds = model.forecast(len(out_index))
 
-        return pd.Series(
-            preds, index=pd.date_range(start=start_date, end=end_date, freq=self.freq)
-        )
+        return pd.Series(preds, index=out_index)
 
     def _predict_ensemble(
         self,
+        model: Any,
         start_date: dt.datetime,
         end_date: dt.datetime,
         last_data_date: dt.datetime,
-        exogenous: pd.DataFrame,
+        out_index: pd.DatetimeIndex,
+        exogenous: pd.DataFrame = None,
     ) -> pd.Series:
-        """Uses all other fit models to predict between the given dates and averages them"""
+        """
+        Uses all other fit models to predict between the given dates and averages them. `model` is
+        only there to match the other predict methods, since the ensemble has no fit model of its own
+        """
         ensemble_model_predictions = []
 
-        if "auto_arima" in self.model_names:
-            # todo: the way this works is kind of janky right now. probably want to move away from setting
-            #  and resetting the fit_model attribute for each candidate model
-            for candidate in self.candidate_models:
-                if candidate.model_type == "auto_arima":
-                    self.fit_model = candidate.fit_model
-            preds = self._predict_auto_arima(
-                start_date, end_date, last_data_date, exogenous
+        for model_type in self._base_model_fitters:
+            if model_type not in self._candidates_by_type:
+                continue
+            preds = self._predict_dispatch[model_type](
+                self._candidates_by_type[model_type].fit_model,
+                start_date,
+                end_date,
+                last_data_date,
+                out_index,
+                exogenous,
             )
-            preds = preds.rename("auto_arima_predictions")
-            ensemble_model_predictions.append(preds)
+            ensemble_model_predictions.append(preds.rename(f"{model_type}_predictions"))
 
-        if "exponential_smoothing" in self.model_names:
-            for candidate in self.candidate_models:
-                if candidate.model_type == "exponential_smoothing":
-                    self.fit_model = candidate.fit_model
-            preds = self._predict_exponential_smoothing(start_date, end_date)
-            preds = preds.rename("exponential_smoothing_predictions")
-            ensemble_model_predictions.append(preds)
+        # each model predicts over the same dates, so the predictions can be joined in one pass
+        all_predictions = pd.concat(ensemble_model_predictions, axis="columns")
+        # averaging the raw array skips pandas' per-row dispatch and index alignment
+        ensemble_predictions = all_predictions.to_numpy().mean(axis=1)
 
-        if "tbats" in self.model_names:
-            for candidate in self.candidate_models:
-                if candidate.model_type == "tbats":
-                    self.fit_model = candidate.fit_model
-            preds = self._predict_tbats(start_date, end_date, last_data_date)
-            preds = preds.rename("tbats_predictions")
-            ensemble_model_predictions.append(preds)
-
-        all_predictions = reduce(
-            lambda left, right: pd.merge(
-                left, right, left_index=True, right_index=True
-            ),
-            ensemble_model_predictions,
-        )
-        all_predictions["en_test_predictions"] = all_predictions.mean(axis="columns")
-
-        self.fit_model = None
-        self.fit_model_type = "ensemble"
-
-        return pd.Series(
-            all_predictions["en_test_predictions"].values,
-            index=pd.date_range(start=start_date, end=end_date, freq=self.freq),
-        )
+        return pd.Series(ensemble_predictions, index=out_index)
 
     def predict(
         self,
@@ -525,16 +649,22 @@ class AutoTS:
                 "Model can't make predictions without first calling `.fit()`!"
             )
 
+        if self.freq is None:
+            raise ValueError(
+                "Could not infer a frequency from the dates given during fit, so there's no way to "
+                "know which dates to predict. Pass `freq` to `.fit()` to set one explicitly"
+            )
+
         val.validate_predict_dates(start, end)
         self._set_prediction_index(start, end)
-        pred_start = self.prediction_index[0]
-        pred_end = self.prediction_index[-1]
+        # every model's predictions share this index, so it's only built once per call
+        out_index = self.prediction_index
+        pred_start = out_index[0]
+        pred_end = out_index[-1]
 
-        last_period = self.data.index[-1]
+        last_period = self._last_data_date
         # check that start date is before or right after that last date given during training
-        latest_valid_start = pd.date_range(
-            self.data.index[-1], periods=2, freq=self.data.index.inferred_freq
-        )[-1]
+        latest_valid_start = self._latest_valid_start
         if pred_start > latest_valid_start:
             raise ValueError(
                 f"`start` must be no more than 1 period past the last date of data received"
@@ -579,19 +709,29 @@ class AutoTS:
                 f"Exogenous regressor(s) must contain all dates in your prediction interval. The following dates are missing: {[d for d in self.prediction_index.tolist() if d not in exogenous.index.tolist()]}"
             )
 
-        if self.fit_model_type == "auto_arima":
-            return self._predict_auto_arima(
-                pred_start, pred_end, last_period, exogenous
-            )
-
-        if self.fit_model_type == "exponential_smoothing":
-            return self._predict_exponential_smoothing(pred_start, pred_end)
-
-        if self.fit_model_type == "tbats":
-            return self._predict_tbats(pred_start, pred_end, last_period)
+        return self._predict_dispatch[self.fit_model_type](
+            self.fit_model, pred_start, pred_end, last_period, out_index, exogenous
+        )
 
-        if self.fit_model_type == "ensemble":
-            return self._predict_ensemble(pred_start, pred_end, last_period, exogenous)
+    def _locate_prediction_dates(
+        self, start_date: dt.datetime, end_date: dt.datetime
+    ) -> Tuple[int, int]:
+        """
+        Finds the positions of the start and end dates in the data given during fit. Dates after the
+        last date given during fit are placed at the end of the data
+        """
+        start_idx, end_idx = np.searchsorted(
+            self._index_values,
+            [pd.Timestamp(start_date).to_datetime64(), pd.Timestamp(end_date).to_datetime64()],
+        )
+        return int(start_idx), int(end_idx)
+
+    @staticmethod
+    def _num_out_of_sample_periods(
+        out_index: pd.DatetimeIndex, last_data_date: dt.datetime
+    ) -> int:
+        """Counts the periods in the prediction index that come after the last date given during fit"""
+        return len(out_index) - int(out_index.searchsorted(last_data_date, side="right"))
 
     def _set_prediction_index(
         self, start: Union[dt.datetime, str], end: Union[dt.datetime, str]
@@ -1,12 +1,42 @@
+import numpy as np
 import pandas as pd
 
 
+def _mse_kernel(predictions: np.ndarray, actuals: np.ndarray) -> float:
+    return float(np.nanmean((predictions - actuals) ** 2))
+
+
+def _rmse_kernel(predictions: np.ndarray, actuals: np.ndarray) -> float:
+    return float(np.sqrt(_mse_kernel(predictions, actuals)))
+
+
+def _mase_denominator(actuals: np.ndarray, step_size: int = 1) -> float:
+    """Average absolute error of a naive forecast that predicts the value `step_size` periods back"""
+    if not 1 <= step_size < len(actuals):
+        raise ValueError(
+            f"`step_size` must be at least 1 and less than the number of actuals ({len(actuals)}), "
+            f"received {step_size}"
+        )
+    # add a small amount to avoid dividing by 0
+    abs_shifted_error = np.abs(actuals[step_size:] - actuals[:-step_size]) + 0.01
+    return float(np.nansum(abs_shifted_error) / (len(actuals) - step_size))
+
+
+def _mase_kernel(
+    predictions: np.ndarray, actuals: np.ndarray, step_size: int = 1, denom: float = None
+) -> float:
+    if denom is None:
+        denom = _mase_denominator(actuals, step_size)
+
+    return float(np.nanmean(np.abs(actuals - predictions)) / denom)
+
+
 def mse(data: pd.DataFrame, prediction: str, actuals: str):
-    return ((data[prediction] - data[actuals]) ** 2).mean()
+    return _mse_kernel(data[prediction].to_numpy(dtype=float), data[actuals].to_numpy(dtype=float))
 
 
 def rmse(data: pd.DataFrame, prediction: str, actuals: str):
-    return mse(data, prediction, actuals)
+    return _rmse_kernel(data[prediction].to_numpy(dtype=float), data[actuals].to_numpy(dtype=float))
 
 
 def mape(data: pd.DataFrame, prediction: str, actuals: str):
@@ -17,13 +47,12 @@ def smape(data: pd.DataFrame, prediction: str, actuals: str):
     pass
 
 
-def mase(data: pd.DataFrame, prediction: str, actuals: str, step_size: int = 1):
-    data = data[[prediction, actuals]].copy()
-    # add a small amount to avoid dividing by 0
-    data['abs_shifted_error'] = abs(data[actuals] - data[actuals].shift(step_size)) + 0.01
-    data['abs_prediction_error'] = abs(data[actuals] - data[prediction])
-
-    avg_shifted_error = data[~data['abs_shifted_error'].isna()]['abs_shifted_error'].sum() / (len(data) - step_size)
-    data['abs_scaled_error'] = data['abs_prediction_error'] / avg_shifted_error
-
-    return data['abs_scaled_error'].mean()
+def mase(data: pd.DataFrame, prediction: str, actuals: str, step_size: int = 1, denom: float = None):
+    """
+    Mean Absolute Scaled Error
+    :param denom: precomputed naive forecast error (see `_mase_denominator`). Useful when scoring
+    several sets of predictions against the same actuals. If None, it's computed from `actuals`
+    """
+    return _mase_kernel(
+        data[prediction].to_numpy(dtype=float), data[actuals].to_numpy(dtype=float), step_size, denom
+    )
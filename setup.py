@@ -3,7 +3,14 @@ from setuptools import setup, find_packages
 with open("README.md", "r") as f:
     readme = f.read()
 
-requirements = ["pandas>=1.2.0", "pmdarima>=1.8.0", "tbats>=1.1.0", "statsmodels>=0.12.2"]
+requirements = [
+    "pandas>=1.2.0",
+    "pmdarima>=1.8.0",
+    "tbats>=1.1.0",
+    "statsmodels>=0.12.2",
+    "joblib>=0.14.0",
+    "threadpoolctl>=2.0.0",
+]
 
 setup(
     name="auto-bots",
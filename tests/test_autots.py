@@ -0,0 +1,235 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from joblib import delayed
+
+from auto_bots.AutoTS import AutoTS
+from auto_bots.utils.error_metrics import _mase_denominator
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "examples"
+
+
+def load_airline() -> pd.DataFrame:
+    airline = pd.read_csv(EXAMPLES_DIR / "airline_passengers" / "AirPassengers.csv")
+    airline["Month"] = pd.to_datetime(airline["Month"])
+    airline = airline.set_index("Month")
+    return airline.rename({"Passengers": "ts"}, axis="columns")
+
+
+def load_shampoo() -> pd.DataFrame:
+    shampoo = pd.read_csv(EXAMPLES_DIR / "shampoo" / "shampoo.csv")
+    shampoo["Month"] = pd.to_datetime(shampoo["Month"])
+    shampoo = shampoo.set_index("Month")
+    return shampoo.rename({"Sales": "ts"}, axis="columns")
+
+
+def test_mase_lag_defaults_to_seasonal_period():
+    airline = load_airline()
+    model = AutoTS(model_names=["exponential_smoothing"], seasonal_period=12)
+    model.fit(airline, "ts")
+
+    assert model.mase_seasonal_period == 12
+    assert model._mase_denom == _mase_denominator(airline["ts"].to_numpy(dtype=float), 12)
+
+
+def test_mase_seasonal_period_validation():
+    for mase_seasonal_period in [12, np.int64(12), 12.0]:
+        model = AutoTS(
+            model_names=["exponential_smoothing"], mase_seasonal_period=mase_seasonal_period
+        )
+        assert model.mase_seasonal_period == 12 and type(model.mase_seasonal_period) is int
+
+    for mase_seasonal_period in [True, 0, -3, 2.5, "12"]:
+        with pytest.raises(ValueError):
+            AutoTS(model_names=["exponential_smoothing"], mase_seasonal_period=mase_seasonal_period)
+
+
+def test_mase_lag_falls_back_to_one():
+    """Seasonal periods longer than the series, or that round down to 0, use a lag of 1"""
+    shampoo = load_shampoo()
+    lag_one_denom = _mase_denominator(shampoo["ts"].to_numpy(dtype=float), 1)
+
+    for seasonal_period in [40, 0.5]:
+        model = AutoTS(model_names=["tbats"], seasonal_period=seasonal_period)
+        model.fit(shampoo, "ts")
+
+        assert model._mase_denom == lag_one_denom
+        assert np.isfinite(model.best_model_error) and model.best_model_error > 0
+
+
+def test_predict_requires_frequency():
+    # dropping a row leaves gaps pandas can't infer a frequency from
+    shampoo = load_shampoo()
+    shampoo = shampoo.drop(index=shampoo.index[10])
+    model = AutoTS(model_names=["exponential_smoothing"])
+    model.fit(shampoo, "ts")
+
+    assert model.freq is None
+    with pytest.raises(ValueError):
+        model.predict(shampoo.index[3], shampoo.index[6])
+
+
+def test_parallel_arima_search_respects_n_jobs(monkeypatch):
+    import pmdarima
+
+    auto_arima = pmdarima.auto_arima
+    calls = []
+
+    def recording_auto_arima(*args, **kwargs):
+        calls.append(kwargs)
+        return auto_arima(*args, **kwargs)
+
+    monkeypatch.setattr(pmdarima, "auto_arima", recording_auto_arima)
+
+    shampoo = load_shampoo()
+    model = AutoTS(
+        model_names=["auto_arima", "exponential_smoothing"],
+        parallel_arima_search=True,
+        auto_arima_args={"n_jobs": 2},
+    )
+    model.fit(shampoo, "ts")
+
+    assert calls[0]["n_jobs"] == 2
+    assert calls[0]["stepwise"] is False
+    assert [candidate.model_type for candidate in model.candidate_models] == [
+        "auto_arima",
+        "exponential_smoothing",
+    ]
+
+
+def airline_prediction_ranges(train: pd.DataFrame) -> dict:
+    """Start and end dates hitting each branch of the prediction methods"""
+    last = train.index[-1]
+    return {
+        "in_sample": (train.index[3], train.index[30]),
+        "mixed": (train.index[-5], last + pd.DateOffset(months=4)),
+        "start_is_last": (last, last + pd.DateOffset(months=4)),
+        "out_of_sample": (last + pd.DateOffset(months=1), last + pd.DateOffset(months=12)),
+    }
+
+
+def test_exponential_smoothing_positional_predictions_match_labels():
+    train = load_airline()[:-12]
+    model = AutoTS(model_names=["exponential_smoothing"], seasonal_period=12)
+    model.fit(train, "ts")
+
+    for case, (start, end) in airline_prediction_ranges(train).items():
+        expected = model.fit_model.predict(start=start, end=end)
+        predictions = model.predict(start, end)
+        assert predictions.index.equals(pd.date_range(start, end, freq="MS")), case
+        np.testing.assert_allclose(predictions.to_numpy(), expected.to_numpy(), err_msg=case)
+
+
+def test_tbats_positional_predictions_match_labels():
+    train = load_airline()[:-12]
+    model = AutoTS(model_names=["tbats"], seasonal_period=12)
+    model.fit(train, "ts")
+    in_sample = pd.Series(model.fit_model.y_hat, index=train.index)
+    last = train.index[-1]
+
+    for case, (start, end) in airline_prediction_ranges(train).items():
+        if end <= last:
+            expected = in_sample.loc[start:end].to_numpy()
+        elif start <= last:
+            num_after = len(pd.date_range(last, end, freq="MS")) - 1
+            expected = np.concatenate(
+                [in_sample.loc[start:].to_numpy(), model.fit_model.forecast(num_after)]
+            )
+        else:
+            expected = model.fit_model.forecast(len(pd.date_range(start, end, freq="MS")))
+
+        predictions = model.predict(start, end)
+        assert predictions.index.equals(pd.date_range(start, end, freq="MS")), case
+        np.testing.assert_allclose(predictions.to_numpy(), expected, err_msg=case)
+
+
+def test_exponential_smoothing_warm_starts_refit(monkeypatch):
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    airline = load_airline()
+    model = AutoTS(model_names=["exponential_smoothing"], seasonal_period=12)
+    model.fit(airline, "ts")
+
+    assert model.fit_model.mle_retvals is not None
+    cached_params = model._es_warm_cache[len(airline)]
+    np.testing.assert_array_equal(cached_params, model.fit_model.mle_retvals.x)
+
+    es_fit = ExponentialSmoothing.fit
+    fit_kwargs = []
+
+    def recording_fit(self, *args, **kwargs):
+        fit_kwargs.append(kwargs)
+        return es_fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(ExponentialSmoothing, "fit", recording_fit)
+    model.fit(airline, "ts")
+
+    np.testing.assert_array_equal(fit_kwargs[0]["start_params"], cached_params)
+    assert fit_kwargs[0]["use_brute"] is False
+    assert np.isfinite(model.best_model_error)
+
+
+def test_refit_in_worker_pool(monkeypatch):
+    import auto_bots.AutoTS as auto_ts_module
+
+    # make sure the models are spread across worker processes, even on a single core machine
+    monkeypatch.setattr(auto_ts_module, "cpu_count", lambda: 2)
+    payload_sizes = []
+
+    def recording_delayed(function):
+        payload_sizes.append(len(pickle.dumps(function.__self__)))
+        return delayed(function)
+
+    monkeypatch.setattr(auto_ts_module, "delayed", recording_delayed)
+
+    airline = load_airline()
+    model = AutoTS(model_names=["exponential_smoothing", "tbats", "ensemble"], seasonal_period=12)
+    for _ in range(2):
+        model.fit(airline, "ts")
+
+        assert model.n_fit_workers == 2
+        assert [candidate.model_type for candidate in model.candidate_models] == [
+            "exponential_smoothing",
+            "tbats",
+            "ensemble",
+        ]
+        assert all(np.isfinite(candidate.error) for candidate in model.candidate_models)
+        assert len(airline) in model._es_warm_cache
+        assert len(model.predict(airline.index[-3], airline.index[-1] + pd.DateOffset(months=3))) == 6
+
+    # the refit's workers shouldn't receive the first fit's models
+    assert max(payload_sizes[2:]) < 2 * max(payload_sizes[:2])
+
+
+def test_predict_uses_given_frequency():
+    shampoo = load_shampoo()
+    model = AutoTS(model_names=["exponential_smoothing"])
+    model.fit(shampoo, "ts", freq="MS")
+
+    assert model.freq == "MS"
+    predictions = model.predict(shampoo.index[3], shampoo.index[-1] + pd.DateOffset(months=2))
+    assert predictions.index.equals(
+        pd.date_range(shampoo.index[3], shampoo.index[-1] + pd.DateOffset(months=2), freq="MS")
+    )
+    assert np.isfinite(predictions.to_numpy()).all()
+
+    with pytest.raises(ValueError):
+        model.fit(shampoo, "ts", freq="not a frequency")
+
+
+def test_fit_when_every_error_is_nan(monkeypatch):
+    import auto_bots.AutoTS as auto_ts_module
+
+    # keep the fits in this process, where the patched error metric applies
+    monkeypatch.setattr(auto_ts_module, "cpu_count", lambda: 1)
+    monkeypatch.setattr(AutoTS, "_error_metric", lambda self, predictions, actuals: np.nan)
+
+    shampoo = load_shampoo()
+    model = AutoTS(model_names=["exponential_smoothing", "tbats"])
+    model.fit(shampoo, "ts")
+
+    assert model.fit_model_type == "exponential_smoothing"
+    assert np.isnan(model.best_model_error)
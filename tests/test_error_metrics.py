@@ -1,6 +1,7 @@
 import pandas as pd
+import pytest
 
-from auto_bots.utils.error_metrics import mase, mse
+from auto_bots.utils.error_metrics import mase, mse, rmse
 
 
 def test_mase(tolerance: float = 0.01):
@@ -23,6 +24,34 @@ def test_mase(tolerance: float = 0.01):
         )
 
 
+def test_seasonal_mase(tolerance: float = 0.01):
+    """Tests Mean Absolute Squared Error scaled by a seasonal naive forecast"""
+    mase_test_df = pd.DataFrame(data={"prediction": [12, 18, 14, 16], "actuals": [10, 20, 15, 15]})
+    avg_shifted_error = (abs(15 - 10) + abs(15 - 20)) / 2
+    mase_test_df["scaled_prediction_error"] = (
+        abs(mase_test_df["prediction"] - mase_test_df["actuals"]) / avg_shifted_error
+    )
+    correct_error = mase_test_df["scaled_prediction_error"].mean()
+
+    test_error = mase(mase_test_df, "prediction", "actuals", 2)
+
+    try:
+        assert abs(correct_error - test_error) < tolerance
+        print("Passed seasonal MASE test")
+    except AssertionError:
+        raise AssertionError(
+            f"Seasonal MASE test failed: Difference between {correct_error} and {test_error} "
+            f"is greater than {tolerance}"
+        )
+
+
+def test_mase_rejects_invalid_step_size():
+    mase_test_df = pd.DataFrame(data={"prediction": [12, 18, 14, 16], "actuals": [10, 20, 15, 15]})
+    for step_size in [0, 4]:
+        with pytest.raises(ValueError):
+            mase(mase_test_df, "prediction", "actuals", step_size)
+
+
 def test_mse(tolerance: float = 0.01):
     mse_test_df = pd.DataFrame(data={"prediction": [12, 18, 14, 16], "actuals": [10, 20, 15, 15]})
     correct_error = ((12 - 10) ** 2 + (18 - 20) ** 2 + (14 - 15) ** 2 + (16 - 15) ** 2) / 4
@@ -37,6 +66,22 @@ def test_mse(tolerance: float = 0.01):
         )
 
 
+def test_rmse(tolerance: float = 0.01):
+    rmse_test_df = pd.DataFrame(data={"prediction": [12, 18, 14, 16], "actuals": [10, 20, 15, 15]})
+    correct_error = (((12 - 10) ** 2 + (18 - 20) ** 2 + (14 - 15) ** 2 + (16 - 15) ** 2) / 4) ** 0.5
+    test_error = rmse(rmse_test_df, "prediction", "actuals")
+
+    try:
+        assert abs(correct_error - test_error) < tolerance
+        print("Passed RMSE test")
+    except AssertionError:
+        raise AssertionError(
+            f"RMSE test failed: Difference between {correct_error} and {test_error} " f"is greater than {tolerance}"
+        )
+
+
 if __name__ == "__main__":
     test_mase()
+    test_seasonal_mase()
     test_mse()
+    test_rmse()